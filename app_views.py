@@ -6,7 +6,16 @@ import numpy as np
 import plotly.graph_objects as go
 import streamlit as st
 from csv_overlay import build_uploaded_points_template, downsample_grouped_points, parse_uploaded_points
-from generators import generate_petroleum_deposits, generate_realistic_deposits
+from generators import (
+    MINERAL_MODE_IDS,
+    MODE_CONTACT,
+    MODE_OREBODY,
+    MODE_PLACER,
+    MODE_SEDIMENTARY,
+    MODE_VEINS,
+    generate_petroleum_deposits,
+    generate_realistic_deposits,
+)
 from real_data import format_production_summary, get_sample_production_data
 from usgs_data import format_usgs_summary, get_latest_usgs_values, get_sample_usgs_mineral_data
 
@@ -25,7 +34,17 @@ PETROLEUM = {
     "Gas Hydrates": "dodgerblue",
 }
 
+MINERAL_MODE_CONTEXT = {
+    MODE_OREBODY: "**Orebody Systems:** Pipe-like or lode deposits formed by hydrothermal processes. Often associated with igneous intrusions.",
+    MODE_VEINS: "**Hydrothermal Veins:** Fracture-filling deposits with branching patterns. Common for precious metals.",
+    MODE_SEDIMENTARY: "**Sedimentary Layers:** Stratiform deposits in sedimentary rocks. Common for coal and iron formations.",
+    MODE_CONTACT: "**Contact Metamorphic:** Deposits formed in aureoles around igneous intrusions through thermal metamorphism.",
+    MODE_PLACER: "**Placer Deposits:** Concentration of heavy minerals in alluvial sediments. Common for gold and gemstones.",
+}
+
 CHART_TEMPLATE = "plotly_white"
+DEPOSIT_CACHE_MAX_ENTRIES = 64
+FIGURE_CACHE_MAX_ENTRIES = 16
 UPLOAD_COORDINATE_BOUNDS = (-10000.0, 10000.0)
 
 MINERAL_PRESETS = {
@@ -147,7 +166,9 @@ def _build_cross_section_figure(points_by_label, axis_choice, title):
 
 def _coerce_xyz_array(coords):
     try:
-        array = np.asarray(coords, dtype=float)
+        array = np.asarray(coords)
+        if array.dtype != np.float32:
+            array = array.astype(float)
     except (TypeError, ValueError):
         return None
     if array.size == 0:
@@ -156,6 +177,30 @@ def _coerce_xyz_array(coords):
         return None
     return array
 
+def _merge_nearby_points(coords, radius):
+    """Collapse points closer than radius into centroids and return (centroids, counts)."""
+    if radius <= 0 or len(coords) < 2:
+        return coords, np.ones(len(coords), dtype=int)
+
+    # Imported lazily so reruns with merging disabled never pay scipy's import cost.
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    from scipy.spatial import cKDTree
+
+    pairs = cKDTree(coords).query_pairs(r=radius, output_type="ndarray")
+    if len(pairs) == 0:
+        return coords, np.ones(len(coords), dtype=int)
+
+    n_points = len(coords)
+    adjacency = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n_points, n_points))
+    n_groups, labels = connected_components(adjacency, directed=False)
+
+    counts = np.bincount(labels, minlength=n_groups)
+    centroids = np.column_stack(
+        [np.bincount(labels, weights=coords[:, axis], minlength=n_groups) / counts for axis in range(3)]
+    )
+    return centroids.astype(coords.dtype, copy=False), counts
+
 def _build_usgs_latest_rows(limit=None):
     records = get_latest_usgs_values(limit=limit)
     return [(entry["mineral"], entry["year"], entry["value"]) for entry in records]
@@ -169,10 +214,12 @@ def _apply_3d_layout(
     zaxis_title,
     height,
     camera_eye=(1.5, 1.5, 1.2),
+    uirevision=None,
 ):
     fig.update_layout(
         title=title,
         template=CHART_TEMPLATE,
+        uirevision=uirevision,
         scene=dict(
             xaxis_title=xaxis_title,
             yaxis_title=yaxis_title,
@@ -193,12 +240,21 @@ def _add_grouped_scatter3d_traces(
     opacity,
     line_color,
     hovertemplate_for_group,
+    merge_radius=0.0,
+    hover_enabled=True,
 ):
     for index, label in enumerate(sorted(grouped_points)):
         coords = _coerce_xyz_array(grouped_points[label])
         if coords is None or len(coords) == 0:
             continue
 
+        sizes = marker_size
+        if merge_radius > 0:
+            merged, counts = _merge_nearby_points(coords, merge_radius)
+            if len(merged) < len(coords):
+                coords = merged
+                sizes = (marker_size + np.log(counts)).astype(np.float32)
+
         fig.add_trace(
             go.Scatter3d(
                 x=coords[:, 0],
@@ -206,13 +262,14 @@ def _add_grouped_scatter3d_traces(
                 z=coords[:, 2],
                 mode="markers",
                 marker=dict(
-                    size=marker_size,
+                    size=sizes,
                     color=color_for_group(label, index),
                     opacity=opacity,
                     line=dict(color=line_color, width=1),
                 ),
                 name=label,
-                hovertemplate=hovertemplate_for_group(label),
+                hovertemplate=hovertemplate_for_group(label) if hover_enabled else None,
+                hoverinfo=None if hover_enabled else "skip",
             )
         )
 
@@ -233,6 +290,9 @@ def build_points_csv(points_by_label, unit_label):
         coords = _coerce_xyz_array(points_by_label[label])
         if coords is None:
             continue
+        if coords.dtype == np.float32:
+            # Round-trip through float32's shortest repr so the six exported decimals carry no rounding noise.
+            coords = coords.astype(str).astype(float)
         for x, y, z in coords:
             writer.writerow([label, f"{x:.6f}", f"{y:.6f}", f"{z:.6f}", unit_label])
 
@@ -259,9 +319,8 @@ def summarize_point_groups(points_by_label):
         if coords is None:
             continue
 
-        xs = coords[:, 0]
-        ys = coords[:, 1]
         zs = coords[:, 2]
+        centroid = coords.mean(axis=0, dtype=np.float64)
 
         count = len(coords)
         summaries.append(
@@ -270,10 +329,10 @@ def summarize_point_groups(points_by_label):
                 "Count": count,
                 "Min Z": round(float(zs.min()), 2),
                 "Max Z": round(float(zs.max()), 2),
-                "Mean Z": round(float(zs.mean()), 2),
-                "Centroid X": round(float(xs.mean()), 2),
-                "Centroid Y": round(float(ys.mean()), 2),
-                "Centroid Z": round(float(zs.mean()), 2),
+                "Mean Z": round(float(centroid[2]), 2),
+                "Centroid X": round(float(centroid[0]), 2),
+                "Centroid Y": round(float(centroid[1]), 2),
+                "Centroid Z": round(float(centroid[2]), 2),
             }
         )
     return summaries
@@ -319,6 +378,106 @@ def _get_cached_production_data():
 def _get_cached_usgs_data():
     return get_sample_usgs_mineral_data()
 
+@st.cache_data(show_spinner=False, max_entries=DEPOSIT_CACHE_MAX_ENTRIES)
+def _get_cached_mineral_deposits(mineral, mode, n_deposits, seed, depth_factor, complexity, noise_scale):
+    return generate_realistic_deposits(
+        mineral, mode, n_deposits, seed, depth_factor, complexity, noise_scale=noise_scale
+    )
+
+@st.cache_data(show_spinner=False, max_entries=DEPOSIT_CACHE_MAX_ENTRIES)
+def _get_cached_petroleum_deposits(deposit_type, basin_size, reservoir_count, trap_efficiency, seed, noise_scale):
+    return generate_petroleum_deposits(
+        deposit_type, basin_size, reservoir_count, trap_efficiency, seed, noise_scale=noise_scale
+    )
+
+def _collect_mineral_deposits(selected_minerals, mode, n_deposits, seed, depth_factor, complexity, noise_scale):
+    # Cached per mineral so toggling one checkbox only generates the newly selected label.
+    return {
+        mineral: _get_cached_mineral_deposits(
+            mineral, mode, n_deposits, seed, depth_factor, complexity, noise_scale
+        )
+        for mineral in selected_minerals
+    }
+
+def _collect_petroleum_deposits(
+    selected_petroleum, basin_size, reservoir_count, trap_efficiency, seed, noise_scale
+):
+    return {
+        pet_type: _get_cached_petroleum_deposits(
+            pet_type, basin_size, reservoir_count, trap_efficiency, seed, noise_scale
+        )
+        for pet_type in selected_petroleum
+    }
+
+@st.cache_data(show_spinner=False, max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def _build_mineral_figure(
+    selected_minerals, mode, n_deposits, seed, depth_factor, complexity, noise_scale, merge_radius, hover_enabled
+):
+    deposits = _collect_mineral_deposits(
+        selected_minerals, mode, n_deposits, seed, depth_factor, complexity, noise_scale
+    )
+
+    fig = go.Figure()
+    _add_grouped_scatter3d_traces(
+        fig,
+        deposits,
+        lambda label, index: MINERALS[label],
+        marker_size=6,
+        opacity=0.8,
+        line_color="white",
+        hovertemplate_for_group=lambda label: (
+            f"<b>{label}</b><br>X: %{{x:.1f}}<br>Y: %{{y:.1f}}<br>Depth: %{{z:.1f}}<extra></extra>"
+        ),
+        merge_radius=merge_radius,
+        hover_enabled=hover_enabled,
+    )
+
+    _apply_3d_layout(
+        fig,
+        title=f"3D Mineral Deposit Model - {mode}",
+        xaxis_title="Easting (km)",
+        yaxis_title="Northing (km)",
+        zaxis_title="Elevation (m)",
+        height=600,
+        uirevision="minerals",
+    )
+    fig.update_layout(legend_title_text="Minerals")
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def _build_petroleum_figure(
+    selected_petroleum, basin_size, reservoir_count, trap_efficiency, seed, noise_scale, hover_enabled
+):
+    petroleum_deposits = _collect_petroleum_deposits(
+        selected_petroleum, basin_size, reservoir_count, trap_efficiency, seed, noise_scale
+    )
+
+    fig = go.Figure()
+    _add_grouped_scatter3d_traces(
+        fig,
+        petroleum_deposits,
+        lambda label, index: PETROLEUM[label],
+        marker_size=8,
+        opacity=0.7,
+        line_color="black",
+        hovertemplate_for_group=lambda label: (
+            f"<b>{label}</b><br>X: %{{x:.1f}}<br>Y: %{{y:.1f}}<br>Depth: %{{z:.0f}}m<extra></extra>"
+        ),
+        hover_enabled=hover_enabled,
+    )
+
+    _apply_3d_layout(
+        fig,
+        title="3D Petroleum Deposit Model - Sedimentary Basin",
+        xaxis_title="Easting (km)",
+        yaxis_title="Northing (km)",
+        zaxis_title="Depth (m)",
+        height=600,
+        uirevision="petroleum",
+    )
+    fig.update_layout(legend_title_text="Petroleum Deposits")
+    return fig
+
 def render_view_header(title, subtitle):
     st.header(title)
     st.caption(subtitle)
@@ -364,17 +523,13 @@ def render_mineral_view():
         help="Use the same seed to reproduce the same deposit layout.",
     )
 
+    mode_options = list(MINERAL_MODE_IDS)
     modeling_mode = st.sidebar.radio(
         "Geological modelling mode",
-        ["Orebody systems", "Hydrothermal veins", "Sedimentary layers", "Contact metamorphic", "Placer deposits"],
-        index=[
-            "Orebody systems",
-            "Hydrothermal veins",
-            "Sedimentary layers",
-            "Contact metamorphic",
-            "Placer deposits",
-        ].index(mineral_defaults.get("mode", "Orebody systems")),
+        mode_options,
+        index=mode_options.index(mineral_defaults.get("mode", "Orebody systems")),
     )
+    mode_id = MINERAL_MODE_IDS[modeling_mode]
 
     st.sidebar.markdown("**Geological Parameters:**")
     depth_factor = st.sidebar.slider(
@@ -401,41 +556,41 @@ def render_mineral_view():
         0.1,
         help="Adds random perturbation to synthetic coordinates.",
     )
+    merge_radius = st.sidebar.slider(
+        "Marker merge radius (km)",
+        0.0,
+        5.0,
+        0.0,
+        0.5,
+        help="Merges nearly coincident markers into one larger marker to lighten 3D rendering.",
+    )
+    mineral_hover = st.sidebar.checkbox(
+        "Enable hover tooltips",
+        value=False,
+        help="Tooltips add per-point work in the browser; leave off for faster dense plots.",
+    )
 
-    deposits = {}
-    for mineral in selected_minerals:
-        deposits[mineral] = generate_realistic_deposits(
-            mineral,
-            modeling_mode,
-            n_deposits,
-            random_seed,
-            depth_factor,
-            structural_complexity,
-            noise_scale=mineral_noise,
-        )
-
-    fig_minerals = go.Figure()
-    _add_grouped_scatter3d_traces(
-        fig_minerals,
-        deposits,
-        lambda label, index: MINERALS[label],
-        marker_size=6,
-        opacity=0.8,
-        line_color="white",
-        hovertemplate_for_group=lambda label: (
-            f"<b>{label}</b><br>X: %{{x:.1f}}<br>Y: %{{y:.1f}}<br>Depth: %{{z:.1f}}<extra></extra>"
-        ),
+    deposits = _collect_mineral_deposits(
+        tuple(selected_minerals),
+        modeling_mode,
+        n_deposits,
+        random_seed,
+        depth_factor,
+        structural_complexity,
+        mineral_noise,
     )
 
-    _apply_3d_layout(
-        fig_minerals,
-        title=f"3D Mineral Deposit Model - {modeling_mode}",
-        xaxis_title="Easting (km)",
-        yaxis_title="Northing (km)",
-        zaxis_title="Elevation (m)",
-        height=600,
+    fig_minerals = _build_mineral_figure(
+        tuple(selected_minerals),
+        modeling_mode,
+        n_deposits,
+        random_seed,
+        depth_factor,
+        structural_complexity,
+        mineral_noise,
+        merge_radius,
+        mineral_hover,
     )
-    fig_minerals.update_layout(legend_title_text="Minerals")
 
     st.plotly_chart(fig_minerals, use_container_width=True)
     cross_axis = st.radio("Mineral cross-section", ["X-Z", "Y-Z"], horizontal=True)
@@ -444,7 +599,7 @@ def render_mineral_view():
         use_container_width=True,
     )
     st.markdown("### Deposit Summary")
-    mineral_summary = summarize_point_groups({k: v.tolist() for k, v in deposits.items()})
+    mineral_summary = summarize_point_groups(deposits)
     st.table(mineral_summary)
     st.download_button(
         "Download mineral summary (CSV)",
@@ -454,16 +609,7 @@ def render_mineral_view():
     )
 
     st.markdown("### Geological Context")
-    if modeling_mode == "Orebody systems":
-        st.info("**Orebody Systems:** Pipe-like or lode deposits formed by hydrothermal processes. Often associated with igneous intrusions.")
-    elif modeling_mode == "Hydrothermal veins":
-        st.info("**Hydrothermal Veins:** Fracture-filling deposits with branching patterns. Common for precious metals.")
-    elif modeling_mode == "Sedimentary layers":
-        st.info("**Sedimentary Layers:** Stratiform deposits in sedimentary rocks. Common for coal and iron formations.")
-    elif modeling_mode == "Contact metamorphic":
-        st.info("**Contact Metamorphic:** Deposits formed in aureoles around igneous intrusions through thermal metamorphism.")
-    elif modeling_mode == "Placer deposits":
-        st.info("**Placer Deposits:** Concentration of heavy minerals in alluvial sediments. Common for gold and gemstones.")
+    st.info(MINERAL_MODE_CONTEXT[mode_id])
 
     _render_model_assumptions(
         "is modelled elevation/depth output",
@@ -490,6 +636,7 @@ def render_mineral_view():
                 "depth_factor": depth_factor,
                 "structural_complexity": structural_complexity,
                 "uncertainty_noise": mineral_noise,
+                "marker_merge_radius": merge_radius,
             },
         ),
         file_name="mineral_metadata.json",
@@ -559,40 +706,31 @@ def render_petroleum_view():
         key="pet_seed",
         help="Use the same seed to keep basin geometry reproducible.",
     )
+    petroleum_hover = st.sidebar.checkbox(
+        "Enable hover tooltips",
+        value=False,
+        key="pet_hover",
+        help="Tooltips add per-point work in the browser; leave off for faster dense plots.",
+    )
 
-    petroleum_deposits = {}
-    for pet_type in selected_petroleum:
-        petroleum_deposits[pet_type] = generate_petroleum_deposits(
-            pet_type,
-            basin_size,
-            reservoir_count,
-            trap_efficiency,
-            pet_random_seed,
-            noise_scale=petroleum_noise,
-        )
-
-    fig_petroleum = go.Figure()
-    _add_grouped_scatter3d_traces(
-        fig_petroleum,
-        petroleum_deposits,
-        lambda label, index: PETROLEUM[label],
-        marker_size=8,
-        opacity=0.7,
-        line_color="black",
-        hovertemplate_for_group=lambda label: (
-            f"<b>{label}</b><br>X: %{{x:.1f}}<br>Y: %{{y:.1f}}<br>Depth: %{{z:.0f}}m<extra></extra>"
-        ),
+    petroleum_deposits = _collect_petroleum_deposits(
+        tuple(selected_petroleum),
+        basin_size,
+        reservoir_count,
+        trap_efficiency,
+        pet_random_seed,
+        petroleum_noise,
     )
 
-    _apply_3d_layout(
-        fig_petroleum,
-        title="3D Petroleum Deposit Model - Sedimentary Basin",
-        xaxis_title="Easting (km)",
-        yaxis_title="Northing (km)",
-        zaxis_title="Depth (m)",
-        height=600,
+    fig_petroleum = _build_petroleum_figure(
+        tuple(selected_petroleum),
+        basin_size,
+        reservoir_count,
+        trap_efficiency,
+        pet_random_seed,
+        petroleum_noise,
+        petroleum_hover,
     )
-    fig_petroleum.update_layout(legend_title_text="Petroleum Deposits")
 
     st.plotly_chart(fig_petroleum, use_container_width=True)
     petroleum_axis = st.radio("Petroleum cross-section", ["X-Z", "Y-Z"], horizontal=True)
@@ -603,7 +741,7 @@ def render_petroleum_view():
         use_container_width=True,
     )
     st.markdown("### Reservoir Summary")
-    petroleum_summary = summarize_point_groups({k: v.tolist() for k, v in petroleum_deposits.items()})
+    petroleum_summary = summarize_point_groups(petroleum_deposits)
     st.table(petroleum_summary)
     st.download_button(
         "Download petroleum summary (CSV)",
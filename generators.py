@@ -1,15 +1,25 @@
 import hashlib
 import numpy as np
 
-SUPPORTED_MINERAL_MODES = {
-    "Orebody systems",
-    "Hydrothermal veins",
-    "Sedimentary layers",
-    "Contact metamorphic",
-    "Placer deposits",
+MODE_OREBODY, MODE_VEINS, MODE_SEDIMENTARY, MODE_CONTACT, MODE_PLACER = range(5)
+MINERAL_MODE_IDS = {
+    "Orebody systems": MODE_OREBODY,
+    "Hydrothermal veins": MODE_VEINS,
+    "Sedimentary layers": MODE_SEDIMENTARY,
+    "Contact metamorphic": MODE_CONTACT,
+    "Placer deposits": MODE_PLACER,
 }
+SUPPORTED_MINERAL_MODES = set(MINERAL_MODE_IDS)
 
-SUPPORTED_PETROLEUM_TYPES = {"Oil", "Natural Gas", "Oil Shale", "Gas Hydrates"}
+PETROLEUM_TYPE_SETTINGS = {
+    "Oil": {"depth_range": (-3000, -1500), "thickness_range": (50, 200), "basin_gradient": 0.6},
+    "Natural Gas": {"depth_range": (-2500, -800), "thickness_range": (30, 150), "basin_gradient": 0.45},
+    "Oil Shale": {"depth_range": (-4000, -2000), "thickness_range": (100, 500), "basin_gradient": 0.8},
+    "Gas Hydrates": {"depth_range": (-1000, -200), "thickness_range": (20, 100), "basin_gradient": 0.3},
+}
+SUPPORTED_PETROLEUM_TYPES = set(PETROLEUM_TYPE_SETTINGS)
+TRAP_ANTICLINE, TRAP_FAULT, TRAP_STRATIGRAPHIC = range(3)
+TRAP_BASE_POINTS = np.array([100, 80, 60])
 MAX_MINERAL_DEPOSITS = 10000
 MAX_PETROLEUM_RESERVOIRS = 1000
 
@@ -110,7 +120,7 @@ def _validate_text_choice(value, name, choices):
         raise ValueError(f"Unsupported {name}: {value}")
 
 def _empty_coords():
-    return np.zeros((0, 3))
+    return np.zeros((0, 3), dtype=np.float32)
 
 def _apply_noise(coords, rng, noise_scale):
     if noise_scale <= 0 or len(coords) == 0:
@@ -118,11 +128,10 @@ def _apply_noise(coords, rng, noise_scale):
 
     return coords + rng.normal(0, noise_scale, size=coords.shape)
 
-def _unit_vector(vector, fallback):
-    norm = np.linalg.norm(vector)
-    if norm == 0 or not np.isfinite(norm):
-        return np.array(fallback, dtype=float)
-    return vector / norm
+def _unit_vectors(vectors, fallback):
+    norms = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))[:, np.newaxis]
+    valid = (norms > 0) & np.isfinite(norms)
+    return np.where(valid, vectors / np.where(valid, norms, 1.0), np.asarray(fallback, dtype=float))
 
 def generate_realistic_deposits(mineral, mode, n_deposits, seed, depth_factor, complexity, noise_scale=0.0):
     """Generate geologically realistic mineral deposits."""
@@ -138,9 +147,10 @@ def generate_realistic_deposits(mineral, mode, n_deposits, seed, depth_factor, c
     _validate_text_choice(mineral, "mineral", {"Gold", "Silver", "Iron", "Copper", "Coal"})
     _validate_text_choice(mode, "mineral mode", SUPPORTED_MINERAL_MODES)
 
+    mode_id = MINERAL_MODE_IDS[mode]
     rng = np.random.default_rng(derive_stable_seed(seed, mineral))
 
-    if mode == "Orebody systems":
+    if mode_id == MODE_OREBODY:
         center = rng.uniform(-30, 30, size=3)
         strike = rng.uniform(0, 2 * np.pi)
         dip = rng.uniform(np.pi / 6, np.pi / 2)
@@ -150,115 +160,92 @@ def generate_realistic_deposits(mineral, mode, n_deposits, seed, depth_factor, c
 
         axis = np.array([np.cos(strike), np.sin(strike), -np.sin(dip)])
 
-        coords = []
-        for pos in t:
-            base_pos = center + pos * axis
-            scatter = rng.normal(0, 3 + pos * 0.1, 3)
-            scatter = scatter - np.dot(scatter, axis) * axis
-            coords.append(base_pos + scatter)
-
-        coords = np.array(coords)
+        scales = 3 + t * 0.1
+        scatter = rng.normal(0, 1, size=(n_deposits, 3)) * scales[:, np.newaxis]
+        scatter -= (scatter @ axis)[:, np.newaxis] * axis
+        coords = center + t[:, np.newaxis] * axis + scatter
 
-    elif mode == "Hydrothermal veins":
+    elif mode_id == MODE_VEINS:
         start = rng.uniform(-40, 40, size=3)
-        coords = [start]
-
-        current_pos = start.copy()
-        branch_points = []
-
-        for _ in range(n_deposits - 1):
-            direction = rng.normal([0.5, 0.3, -0.2], 0.3)
-            direction = _unit_vector(direction, fallback=[1.0, 0.0, 0.0])
-
-            step_size = rng.uniform(1, 4)
-            current_pos = current_pos + direction * step_size
-            coords.append(current_pos.copy())
-
-            if rng.random() < 0.1 and len(branch_points) < complexity:
-                branch_points.append(current_pos.copy())
 
-        for branch_start in branch_points:
-            branch_length = rng.integers(5, 15)
-            branch_pos = branch_start.copy()
-            for _ in range(branch_length):
-                if len(coords) >= n_deposits:
-                    break
-                direction = rng.normal([0, 0, -0.5], 0.4)
-                direction = _unit_vector(direction, fallback=[0.0, 0.0, -1.0])
-                branch_pos = branch_pos + direction * rng.uniform(1, 3)
-                coords.append(branch_pos.copy())
-
-        coords = np.array(coords[:n_deposits])
-
-    elif mode == "Sedimentary layers":
+        # Reserve up to half of the points for at most `complexity` branches.
+        branch_ends = np.minimum(np.cumsum(rng.integers(5, 15, size=complexity)), n_deposits // 2)
+        branch_lengths = np.diff(branch_ends, prepend=0)
+        branch_lengths = branch_lengths[branch_lengths > 0]
+        main_length = n_deposits - branch_ends[-1]
+
+        directions = rng.normal([0.5, 0.3, -0.2], 0.3, size=(main_length - 1, 3))
+        directions = _unit_vectors(directions, fallback=[1.0, 0.0, 0.0])
+        steps = directions * rng.uniform(1, 4, size=(main_length - 1, 1))
+
+        coords = np.empty((n_deposits, 3))
+        coords[0] = start
+        coords[1:main_length] = start + np.cumsum(steps, axis=0)
+
+        branch_points = coords[rng.integers(0, main_length, size=len(branch_lengths))]
+        filled = main_length
+        for branch_start, branch_length in zip(branch_points, branch_lengths):
+            directions = rng.normal([0, 0, -0.5], 0.4, size=(branch_length, 3))
+            directions = _unit_vectors(directions, fallback=[0.0, 0.0, -1.0])
+            steps = directions * rng.uniform(1, 3, size=(branch_length, 1))
+            coords[filled : filled + branch_length] = branch_start + np.cumsum(steps, axis=0)
+            filled += branch_length
+
+    elif mode_id == MODE_SEDIMENTARY:
         min_layers = 1 if complexity == 1 else 2
         n_layers = rng.integers(min_layers, complexity + 1)
-        coords = []
+        coords = np.empty((n_deposits, 3))
         dip_direction = rng.uniform(0, 2 * np.pi)
         dip_strength = rng.uniform(0.01, 0.08)
         dip_vector = np.array([np.cos(dip_direction), np.sin(dip_direction)])
 
+        points_per_layer = n_deposits // n_layers
         for layer in range(n_layers):
             layer_center = rng.uniform(-40, 40, size=3)
             layer_center[2] = -20 - layer * 10
 
-            points_in_layer = n_deposits // n_layers
-            if layer == n_layers - 1:
-                points_in_layer = n_deposits - len(coords)
+            start = layer * points_per_layer
+            stop = n_deposits if layer == n_layers - 1 else start + points_per_layer
+            count = stop - start
 
-            for _ in range(points_in_layer):
-                theta = rng.uniform(0, 2 * np.pi)
-                r = rng.exponential(15)
-                x = layer_center[0] + r * np.cos(theta)
-                y = layer_center[1] + r * np.sin(theta)
-                lateral_offset = np.array([x - layer_center[0], y - layer_center[1]])
-                dip_offset = dip_strength * np.dot(lateral_offset, dip_vector)
-                z = layer_center[2] + dip_offset + rng.normal(0, 2)
-                coords.append([x, y, z])
+            theta = rng.uniform(0, 2 * np.pi, count)
+            r = rng.exponential(15, count)
+            dx = r * np.cos(theta)
+            dy = r * np.sin(theta)
+            dip_offset = dip_strength * (dx * dip_vector[0] + dy * dip_vector[1])
 
-        coords = np.array(coords)
+            coords[start:stop, 0] = layer_center[0] + dx
+            coords[start:stop, 1] = layer_center[1] + dy
+            coords[start:stop, 2] = layer_center[2] + dip_offset + rng.normal(0, 2, count)
 
-    elif mode == "Contact metamorphic":
+    elif mode_id == MODE_CONTACT:
         intrusion_center = rng.uniform(-20, 20, size=3)
-        coords = []
-
-        for _ in range(n_deposits):
-            distance = rng.exponential(8)
-            theta = rng.uniform(0, 2 * np.pi)
-            phi = rng.uniform(0, np.pi)
 
-            x = intrusion_center[0] + distance * np.sin(phi) * np.cos(theta)
-            y = intrusion_center[1] + distance * np.sin(phi) * np.sin(theta)
-            z = intrusion_center[2] + distance * np.cos(phi)
+        distance = rng.exponential(8, n_deposits)
+        theta = rng.uniform(0, 2 * np.pi, n_deposits)
+        phi = rng.uniform(0, np.pi, n_deposits)
 
-            coords.append([x, y, z])
-
-        coords = np.array(coords)
+        sin_phi = np.sin(phi)
+        directions = np.column_stack((sin_phi * np.cos(theta), sin_phi * np.sin(theta), np.cos(phi)))
+        coords = intrusion_center + distance[:, np.newaxis] * directions
 
     else:  # Placer deposits
         valley_direction = rng.uniform(0, 2 * np.pi)
         valley_axis = np.array([np.cos(valley_direction), np.sin(valley_direction), 0])
 
-        coords = []
         stream_center = rng.uniform(-30, 30, size=3)
         stream_center[2] = 0
 
-        for _ in range(n_deposits):
-            distance_along = rng.normal(0, 20)
-            distance_across = rng.exponential(5)
-            if rng.random() < 0.5:
-                distance_across *= -1
-
-            pos = stream_center + distance_along * valley_axis
-            pos[0] += distance_across * valley_axis[1]
-            pos[1] -= distance_across * valley_axis[0]
-            pos[2] += rng.exponential(2)
-            coords.append(pos)
+        distance_along = rng.normal(0, 20, n_deposits)
+        distance_across = rng.exponential(5, n_deposits) * rng.choice([-1, 1], n_deposits)
 
-        coords = np.array(coords)
+        coords = stream_center + distance_along[:, np.newaxis] * valley_axis
+        coords[:, 0] += distance_across * valley_axis[1]
+        coords[:, 1] -= distance_across * valley_axis[0]
+        coords[:, 2] += rng.exponential(2, n_deposits)
 
     coords[:, 2] *= depth_factor
-    return _apply_noise(coords, rng, noise_scale)
+    return _apply_noise(coords, rng, noise_scale).astype(np.float32, copy=False)
 
 def generate_petroleum_deposits(deposit_type, basin_size, reservoir_count, trap_efficiency, seed, noise_scale=0.0):
     """Generate realistic petroleum deposits."""
@@ -275,75 +262,55 @@ def generate_petroleum_deposits(deposit_type, basin_size, reservoir_count, trap_
 
     rng = np.random.default_rng(derive_stable_seed(seed, deposit_type))
 
-    reservoir_blocks = []
-
-    for _ in range(reservoir_count):
-        basin_center = rng.uniform(-basin_size / 2, basin_size / 2, size=2)
-
-        if deposit_type == "Oil":
-            depth_base = rng.uniform(-3000, -1500)
-            thickness = rng.uniform(50, 200)
-        elif deposit_type == "Natural Gas":
-            depth_base = rng.uniform(-2500, -800)
-            thickness = rng.uniform(30, 150)
-        elif deposit_type == "Oil Shale":
-            depth_base = rng.uniform(-4000, -2000)
-            thickness = rng.uniform(100, 500)
-        else:  # Gas Hydrates
-            depth_base = rng.uniform(-1000, -200)
-            thickness = rng.uniform(20, 100)
-
-        trap_type = rng.choice(["anticline", "fault_trap", "stratigraphic"])
-
-        if trap_type == "anticline":
-            n_points = int(100 * trap_efficiency)
-            r = rng.exponential(basin_size / 8, size=n_points)
-            theta = rng.uniform(0, 2 * np.pi, size=n_points)
-
-            xs = basin_center[0] + r * np.cos(theta)
-            ys = basin_center[1] + r * np.sin(theta)
-            elevation_factor = np.exp(-r / (basin_size / 6))
-            zs = depth_base + thickness * elevation_factor + rng.normal(0, thickness / 10, size=n_points)
-
-            coords = np.column_stack((xs, ys, zs))
-
-        elif trap_type == "fault_trap":
-            n_points = int(80 * trap_efficiency)
-            fault_strike = rng.uniform(0, 2 * np.pi)
-            fault_normal = np.array([-np.sin(fault_strike), np.cos(fault_strike)])
-            along_vector = np.array([np.cos(fault_strike), np.sin(fault_strike)])
-
-            distance_from_fault = rng.exponential(basin_size / 10, size=n_points)
-            along_fault = rng.uniform(-basin_size / 4, basin_size / 4, size=n_points)
-
-            positions = basin_center + np.outer(distance_from_fault, fault_normal)
-            positions += np.outer(along_fault, along_vector)
-            zs = depth_base + rng.uniform(0, thickness, size=n_points)
-
-            coords = np.column_stack((positions[:, 0], positions[:, 1], zs))
-
-        else:  # stratigraphic trap
-            n_points = int(60 * trap_efficiency)
-            xs = basin_center[0] + rng.normal(0, basin_size / 6, size=n_points)
-            ys = basin_center[1] + rng.normal(0, basin_size / 6, size=n_points)
-            zs = depth_base + rng.uniform(0, thickness, size=n_points)
-
-            coords = np.column_stack((xs, ys, zs))
-
-        # Add a basin-wide depth trend where reservoir depth increases away from basin center.
-        radial_distance = np.hypot(coords[:, 0] - basin_center[0], coords[:, 1] - basin_center[1])
-        if deposit_type == "Oil":
-            basin_gradient = 0.6
-        elif deposit_type == "Natural Gas":
-            basin_gradient = 0.45
-        elif deposit_type == "Oil Shale":
-            basin_gradient = 0.8
-        else:  # Gas Hydrates
-            basin_gradient = 0.3
-        coords[:, 2] = coords[:, 2] - radial_distance * basin_gradient
-
-        if len(coords) > 0:
-            reservoir_blocks.append(coords)
-
-    output = np.vstack(reservoir_blocks) if reservoir_blocks else _empty_coords()
-    return _apply_noise(output, rng, noise_scale)
\ No newline at end of file
+    settings = PETROLEUM_TYPE_SETTINGS[deposit_type]
+
+    basin_centers = rng.uniform(-basin_size / 2, basin_size / 2, size=(reservoir_count, 2))
+    depth_bases = rng.uniform(*settings["depth_range"], size=reservoir_count)
+    thicknesses = rng.uniform(*settings["thickness_range"], size=reservoir_count)
+    fault_strikes = rng.uniform(0, 2 * np.pi, size=reservoir_count)
+    trap_types = rng.integers(3, size=reservoir_count)
+
+    points_per_trap = (TRAP_BASE_POINTS * trap_efficiency).astype(int)
+    owners = np.repeat(np.arange(reservoir_count), points_per_trap[trap_types])
+    point_traps = trap_types[owners]
+    coords = np.empty((len(owners), 3))
+
+    rows = np.flatnonzero(point_traps == TRAP_ANTICLINE)
+    if len(rows) > 0:
+        owner = owners[rows]
+        r = rng.exponential(basin_size / 8, size=len(rows))
+        theta = rng.uniform(0, 2 * np.pi, size=len(rows))
+        elevation_factor = np.exp(-r / (basin_size / 6))
+
+        coords[rows, 0] = basin_centers[owner, 0] + r * np.cos(theta)
+        coords[rows, 1] = basin_centers[owner, 1] + r * np.sin(theta)
+        coords[rows, 2] = (
+            depth_bases[owner]
+            + thicknesses[owner] * elevation_factor
+            + rng.normal(0, thicknesses[owner] / 10)
+        )
+
+    rows = np.flatnonzero(point_traps == TRAP_FAULT)
+    if len(rows) > 0:
+        owner = owners[rows]
+        cos_strike = np.cos(fault_strikes[owner])
+        sin_strike = np.sin(fault_strikes[owner])
+        distance_from_fault = rng.exponential(basin_size / 10, size=len(rows))
+        along_fault = rng.uniform(-basin_size / 4, basin_size / 4, size=len(rows))
+
+        coords[rows, 0] = basin_centers[owner, 0] - distance_from_fault * sin_strike + along_fault * cos_strike
+        coords[rows, 1] = basin_centers[owner, 1] + distance_from_fault * cos_strike + along_fault * sin_strike
+        coords[rows, 2] = depth_bases[owner] + rng.uniform(0, thicknesses[owner])
+
+    rows = np.flatnonzero(point_traps == TRAP_STRATIGRAPHIC)
+    if len(rows) > 0:
+        owner = owners[rows]
+        coords[rows, 0] = basin_centers[owner, 0] + rng.normal(0, basin_size / 6, size=len(rows))
+        coords[rows, 1] = basin_centers[owner, 1] + rng.normal(0, basin_size / 6, size=len(rows))
+        coords[rows, 2] = depth_bases[owner] + rng.uniform(0, thicknesses[owner])
+
+    # Add a basin-wide depth trend where reservoir depth increases away from basin center.
+    radial_distance = np.hypot(coords[:, 0] - basin_centers[owners, 0], coords[:, 1] - basin_centers[owners, 1])
+    coords[:, 2] -= radial_distance * settings["basin_gradient"]
+
+    return _apply_noise(coords, rng, noise_scale).astype(np.float32, copy=False)
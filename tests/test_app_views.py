@@ -1,12 +1,21 @@
 import unittest
+from unittest import mock
 import numpy as np
 import json
 import plotly.graph_objects as go
 
 from app_views import (
+    MINERAL_MODE_CONTEXT,
+    MINERAL_PRESETS,
     _add_grouped_scatter3d_traces,
-    _build_usgs_latest_rows,
+    _apply_3d_layout,
     _build_cross_section_figure,
+    _build_usgs_latest_rows,
+    _collect_mineral_deposits,
+    _collect_petroleum_deposits,
+    _get_cached_mineral_deposits,
+    _get_cached_petroleum_deposits,
+    _merge_nearby_points,
     _resolve_preset,
     build_group_summary_csv,
     build_metadata_json,
@@ -14,6 +23,7 @@ from app_views import (
     format_point_group_summary,
     summarize_point_groups,
 )
+from generators import MINERAL_MODE_IDS
 
 class BuildPointsCsvTests(unittest.TestCase):
     def test_build_points_csv_formats_rows(self):
@@ -23,6 +33,13 @@ class BuildPointsCsvTests(unittest.TestCase):
         self.assertEqual(lines[0], "deposit_type,x,y,z,z_unit")
         self.assertEqual(lines[1], "Mine A,1.234568,2.000000,3.100000,m")
 
+    def test_build_points_csv_drops_float32_rounding_noise(self):
+        coords = np.array([(-2889.7908, 12.5, 0.1)], dtype=np.float32)
+        csv_text = build_points_csv({"Mine A": coords}, "m")
+        lines = csv_text.strip().splitlines()
+
+        self.assertEqual(lines[1], "Mine A,-2889.790800,12.500000,0.100000,m")
+
     def test_build_points_csv_with_multiple_labels(self):
         csv_text = build_points_csv({"Mine A": [(1, 2, 3)], "Well B": [(4, 5, 6)]}, "m")
         lines = csv_text.strip().splitlines()
@@ -109,6 +126,13 @@ class ResolvePresetTests(unittest.TestCase):
 
         with self.assertRaisesRegex(TypeError, "preset values must be dictionaries or None"):
             _resolve_preset("A", presets)
+
+    def test_mineral_presets_and_context_cover_supported_modes(self):
+        self.assertEqual(set(MINERAL_MODE_CONTEXT), set(MINERAL_MODE_IDS.values()))
+        for preset in MINERAL_PRESETS.values():
+            if preset is not None:
+                self.assertIn(preset["mode"], MINERAL_MODE_IDS)
+
 class SummarizePointGroupsTests(unittest.TestCase):
     def test_summarize_point_groups_builds_expected_metrics(self):
         summaries = summarize_point_groups({"Mine A": [(0.0, 1.0, -10.0), (2.0, 3.0, -6.0)]})
@@ -123,6 +147,14 @@ class SummarizePointGroupsTests(unittest.TestCase):
     def test_summarize_point_groups_ignores_empty_groups(self):
         summaries = summarize_point_groups({"Mine A": []})
         self.assertEqual(summaries, [])
+
+    def test_summarize_point_groups_accepts_float32_arrays(self):
+        coords = np.array([[0.0, 1.0, -2000.1], [2.0, 3.0, -2000.3]], dtype=np.float32)
+        summaries = summarize_point_groups({"Oil": coords})
+
+        self.assertEqual(summaries[0]["Count"], 2)
+        self.assertEqual(summaries[0]["Mean Z"], -2000.2)
+        self.assertEqual(summaries[0]["Centroid X"], 1.0)
 class BuildGroupSummaryCsvTests(unittest.TestCase):
     def test_build_group_summary_csv_writes_header_and_rows(self):
         csv_text = build_group_summary_csv(
@@ -187,6 +219,28 @@ class CrossSectionFigureTests(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "axis_choice must be 'X-Z' or 'Y-Z'"):
             _build_cross_section_figure({"A": [[1.0, 2.0, -3.0]]}, "Z-Y", "Test")
 
+class Apply3dLayoutTests(unittest.TestCase):
+    def test_apply_3d_layout_sets_uirevision(self):
+        fig = go.Figure()
+        _apply_3d_layout(
+            fig,
+            title="Model",
+            xaxis_title="X",
+            yaxis_title="Y",
+            zaxis_title="Z",
+            height=400,
+            uirevision="minerals",
+        )
+
+        self.assertEqual(fig.layout.uirevision, "minerals")
+        self.assertEqual(fig.layout.scene.zaxis.title.text, "Z")
+
+    def test_apply_3d_layout_leaves_uirevision_unset_by_default(self):
+        fig = go.Figure()
+        _apply_3d_layout(fig, title="Model", xaxis_title="X", yaxis_title="Y", zaxis_title="Z", height=400)
+
+        self.assertIsNone(fig.layout.uirevision)
+
 class GroupedScatterTraceTests(unittest.TestCase):
     def test_grouped_scatter_traces_skip_empty_groups(self):
         fig = go.Figure()
@@ -204,6 +258,133 @@ class GroupedScatterTraceTests(unittest.TestCase):
         self.assertEqual(len(fig.data), 1)
         self.assertEqual(fig.data[0].name, "A")
 
+    def test_add_grouped_scatter3d_traces_keeps_float32_coordinates(self):
+        fig = go.Figure()
+        _add_grouped_scatter3d_traces(
+            fig,
+            {"A": np.array([[1.0, 2.0, 3.0]], dtype=np.float32)},
+            lambda label, index: "red",
+            marker_size=6,
+            opacity=0.8,
+            line_color="white",
+            hovertemplate_for_group=lambda label: label,
+        )
+
+        self.assertEqual(fig.data[0].x.dtype, np.float32)
+
+    def test_grouped_scatter_traces_keep_one_trace_per_label(self):
+        fig = go.Figure()
+        _add_grouped_scatter3d_traces(
+            fig,
+            {"B": np.array([[4.0, 5.0, 6.0]]), "A": np.array([[1.0, 2.0, 3.0], [1.5, 2.5, 3.5]])},
+            lambda label, index: {"A": "red", "B": "blue"}[label],
+            marker_size=6,
+            opacity=0.8,
+            line_color="white",
+            hovertemplate_for_group=lambda label: label,
+        )
+
+        self.assertEqual([trace.name for trace in fig.data], ["A", "B"])
+        self.assertEqual(list(fig.data[0].x), [1.0, 1.5])
+        self.assertEqual(fig.data[0].marker.size, 6)
+
+    def test_grouped_scatter_traces_can_skip_hover(self):
+        fig = go.Figure()
+        _add_grouped_scatter3d_traces(
+            fig,
+            {"A": np.array([[1.0, 2.0, 3.0]])},
+            lambda label, index: "red",
+            marker_size=6,
+            opacity=0.8,
+            line_color="white",
+            hovertemplate_for_group=lambda label: label,
+            hover_enabled=False,
+        )
+
+        self.assertEqual(fig.data[0].hoverinfo, "skip")
+        self.assertIsNone(fig.data[0].hovertemplate)
+
+    def test_grouped_scatter_traces_scale_merged_markers(self):
+        fig = go.Figure()
+        _add_grouped_scatter3d_traces(
+            fig,
+            {"A": np.array([[0.0, 0.0, 0.0], [0.1, 0.0, 0.0], [10.0, 0.0, 0.0]])},
+            lambda label, index: "red",
+            marker_size=6,
+            opacity=0.8,
+            line_color="white",
+            hovertemplate_for_group=lambda label: label,
+            merge_radius=1.0,
+        )
+
+        self.assertEqual(len(fig.data[0].x), 2)
+        self.assertEqual(fig.data[0].marker.size.dtype, np.float32)
+        self.assertTrue(np.allclose(sorted(fig.data[0].marker.size), [6.0, 6.0 + np.log(2)]))
+
+    def test_grouped_scatter_traces_keep_scalar_size_when_nothing_merges(self):
+        fig = go.Figure()
+        _add_grouped_scatter3d_traces(
+            fig,
+            {"A": np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0]])},
+            lambda label, index: "red",
+            marker_size=6,
+            opacity=0.8,
+            line_color="white",
+            hovertemplate_for_group=lambda label: label,
+            merge_radius=1.0,
+        )
+
+        self.assertEqual(fig.data[0].marker.size, 6)
+
+class DepositCacheTests(unittest.TestCase):
+    def test_collect_mineral_deposits_only_generates_uncached_labels(self):
+        _get_cached_mineral_deposits.clear()
+        self.addCleanup(_get_cached_mineral_deposits.clear)
+
+        with mock.patch("app_views.generate_realistic_deposits", return_value=np.zeros((1, 3))) as generate:
+            _collect_mineral_deposits(("Gold",), "Orebody systems", 10, 42, 1.0, 3, 0.0)
+            deposits = _collect_mineral_deposits(("Gold", "Silver"), "Orebody systems", 10, 42, 1.0, 3, 0.0)
+
+        self.assertEqual([call.args[0] for call in generate.call_args_list], ["Gold", "Silver"])
+        self.assertEqual(list(deposits), ["Gold", "Silver"])
+
+    def test_collected_deposits_do_not_depend_on_other_selected_labels(self):
+        for cached in (_get_cached_mineral_deposits, _get_cached_petroleum_deposits):
+            cached.clear()
+            self.addCleanup(cached.clear)
+
+        alone = _collect_mineral_deposits(("Gold",), "Placer deposits", 40, 42, 1.0, 3, 0.0)
+        _get_cached_mineral_deposits.clear()
+        together = _collect_mineral_deposits(("Silver", "Gold", "Coal"), "Placer deposits", 40, 42, 1.0, 3, 0.0)
+        self.assertTrue(np.array_equal(alone["Gold"], together["Gold"]))
+
+        alone = _collect_petroleum_deposits(("Oil Shale",), 60, 3, 0.8, 42, 0.0)
+        _get_cached_petroleum_deposits.clear()
+        together = _collect_petroleum_deposits(("Oil", "Oil Shale"), 60, 3, 0.8, 42, 0.0)
+        self.assertTrue(np.array_equal(alone["Oil Shale"], together["Oil Shale"]))
+
+class MergeNearbyPointsTests(unittest.TestCase):
+    def test_merge_nearby_points_collapses_chains_into_centroids(self):
+        coords = np.array([[0.0, 0.0, 0.0], [0.5, 0.0, 0.0], [1.0, 0.0, 0.0], [9.0, 9.0, 9.0]])
+        centroids, counts = _merge_nearby_points(coords, 0.6)
+
+        self.assertEqual(sorted(counts.tolist()), [1, 3])
+        merged = centroids[np.argmax(counts)]
+        self.assertTrue(np.allclose(merged, [0.5, 0.0, 0.0]))
+
+    def test_merge_nearby_points_passthrough_for_zero_radius(self):
+        coords = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+        centroids, counts = _merge_nearby_points(coords, 0.0)
+
+        self.assertIs(centroids, coords)
+        self.assertEqual(counts.tolist(), [1, 1])
+
+    def test_merge_nearby_points_preserves_float32(self):
+        coords = np.array([[0.0, 0.0, 0.0], [0.1, 0.0, 0.0]], dtype=np.float32)
+        centroids, _ = _merge_nearby_points(coords, 1.0)
+
+        self.assertEqual(centroids.dtype, np.float32)
+
 class SummariesRobustnessTests(unittest.TestCase):
     def test_summarize_point_groups_skips_malformed_coordinates(self):
         summaries = summarize_point_groups({"Good": [[1, 2, 3]], "Bad": [[1, 2]]})
@@ -1,6 +1,11 @@
 import unittest
 import numpy as np
-from generators import derive_stable_seed, generate_petroleum_deposits, generate_realistic_deposits
+from generators import (
+    _unit_vectors,
+    derive_stable_seed,
+    generate_petroleum_deposits,
+    generate_realistic_deposits,
+)
 
 class StableSeedTests(unittest.TestCase):
     def test_derive_stable_seed_normalises_case_and_whitespace(self):
@@ -8,6 +13,10 @@ class StableSeedTests(unittest.TestCase):
         second = derive_stable_seed(42, "gold deposit")
         self.assertEqual(first, second)
 
+    def test_derive_stable_seed_is_stable_across_interpreter_runs(self):
+        self.assertEqual(derive_stable_seed(42, "Gold"), 2955824139)
+        self.assertEqual(derive_stable_seed(42, "Silver"), 2713117687)
+
     def test_derive_stable_seed_rejects_blank_labels(self):
         with self.assertRaisesRegex(ValueError, "label must not be empty"):
             derive_stable_seed(42, "   ")
@@ -21,6 +30,15 @@ class StableSeedTests(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "seed must be a whole number"):
             derive_stable_seed("42.5", "Gold")
 
+class UnitVectorTests(unittest.TestCase):
+    def test_unit_vectors_normalises_rows_and_uses_fallback(self):
+        vectors = np.array([[3.0, 4.0, 0.0], [0.0, 0.0, 0.0], [np.inf, 1.0, 1.0]])
+        result = _unit_vectors(vectors, fallback=[0.0, 0.0, -1.0])
+
+        self.assertTrue(np.allclose(result[0], [0.6, 0.8, 0.0]))
+        self.assertTrue(np.array_equal(result[1], [0.0, 0.0, -1.0]))
+        self.assertTrue(np.array_equal(result[2], [0.0, 0.0, -1.0]))
+
 class GeneratorContractTests(unittest.TestCase):
     def test_mineral_generation_is_deterministic(self):
         first = generate_realistic_deposits("Gold", "Orebody systems", 120, 42, 1.0, 3)
@@ -39,10 +57,39 @@ class GeneratorContractTests(unittest.TestCase):
             coords = generate_realistic_deposits("Copper", mode, 75, 11, 1.2, 4)
             self.assertEqual(coords.shape, (75, 3))
 
+    def test_mineral_generation_returns_float32(self):
+        coords = generate_realistic_deposits("Copper", "Placer deposits", 30, 11, 1.2, 4, noise_scale=0.5)
+        self.assertEqual(coords.dtype, np.float32)
+
     def test_sedimentary_mode_supports_minimum_complexity(self):
         coords = generate_realistic_deposits("Copper", "Sedimentary layers", 20, 11, 1.2, 1)
         self.assertEqual(coords.shape, (20, 3))
 
+    def test_vein_mode_supports_single_deposit(self):
+        coords = generate_realistic_deposits("Gold", "Hydrothermal veins", 1, 11, 1.0, 3)
+        self.assertEqual(coords.shape, (1, 3))
+        self.assertTrue(np.all(np.isfinite(coords)))
+
+    def test_vein_mode_complexity_changes_branching(self):
+        simple = generate_realistic_deposits("Gold", "Hydrothermal veins", 200, 11, 1.0, 1)
+        complex_ = generate_realistic_deposits("Gold", "Hydrothermal veins", 200, 11, 1.0, 5)
+        self.assertEqual(simple.shape, complex_.shape)
+        self.assertFalse(np.array_equal(simple, complex_))
+
+    def test_vein_mode_emits_branch_segments(self):
+        coords = generate_realistic_deposits("Gold", "Hydrothermal veins", 200, 11, 1.0, 5)
+        step_lengths = np.linalg.norm(np.diff(coords, axis=0), axis=1)
+
+        # Walk steps are at most 4 units, so longer jumps mark the start of a branch segment.
+        self.assertGreater(np.count_nonzero(step_lengths > 4.01), 0)
+
+    def test_vein_mode_branch_budget_fits_small_deposit_counts(self):
+        for n_deposits in range(1, 25):
+            for complexity in (1, 3, 5):
+                coords = generate_realistic_deposits("Gold", "Hydrothermal veins", n_deposits, 11, 1.0, complexity)
+                self.assertEqual(coords.shape, (n_deposits, 3))
+                self.assertTrue(np.all(np.isfinite(coords)))
+
     def test_mineral_generation_returns_empty_array_for_zero_points(self):
         coords = generate_realistic_deposits("Copper", "Placer deposits", 0, 11, 1.2, 4)
         self.assertEqual(coords.shape, (0, 3))
@@ -108,6 +155,15 @@ class GeneratorContractTests(unittest.TestCase):
         second = generate_realistic_deposits("Gold", "Orebody systems", 40, 42, 1.0, 3, noise_scale=0.8)
         self.assertTrue(np.array_equal(first, second))
 
+    def test_generation_does_not_touch_global_numpy_random_state(self):
+        np.random.seed(123)
+        expected = np.random.random()
+
+        np.random.seed(123)
+        generate_realistic_deposits("Gold", "Hydrothermal veins", 50, 42, 1.0, 3, noise_scale=0.5)
+        generate_petroleum_deposits("Oil", 50, 3, 0.6, 42, noise_scale=1.0)
+        self.assertEqual(np.random.random(), expected)
+
     def test_petroleum_generation_is_deterministic(self):
         first = generate_petroleum_deposits("Oil", 50, 4, 0.6, 42)
         second = generate_petroleum_deposits("Oil", 50, 4, 0.6, 42)
@@ -120,10 +176,25 @@ class GeneratorContractTests(unittest.TestCase):
             self.assertEqual(coords.ndim, 2)
             self.assertEqual(coords.shape[1], 3)
 
+    def test_petroleum_generation_returns_float32(self):
+        coords = generate_petroleum_deposits("Oil", 50, 3, 0.6, 42)
+        self.assertEqual(coords.dtype, np.float32)
+
     def test_petroleum_generation_returns_empty_array_for_zero_reservoirs(self):
         coords = generate_petroleum_deposits("Oil", 50, 0, 0.6, 42)
         self.assertEqual(coords.shape, (0, 3))
 
+    def test_petroleum_generation_returns_empty_array_when_traps_round_to_zero_points(self):
+        coords = generate_petroleum_deposits("Oil", 50, 5, 0.001, 42, noise_scale=1.0)
+        self.assertEqual(coords.shape, (0, 3))
+
+    def test_petroleum_generation_point_count_matches_trap_sizes(self):
+        coords = generate_petroleum_deposits("Natural Gas", 50, 6, 1.0, 42)
+        self.assertGreaterEqual(len(coords), 6 * 60)
+        self.assertLessEqual(len(coords), 6 * 100)
+        self.assertEqual(len(coords) % 20, 0)
+        self.assertTrue(np.all(np.isfinite(coords)))
+
     def test_petroleum_generation_rejects_invalid_type(self):
         with self.assertRaisesRegex(ValueError, "Unsupported petroleum deposit type"):
             generate_petroleum_deposits("Water", 50, 1, 0.6, 42)